@@ -1,20 +1,56 @@
 ### IMPORTS ###
 import numpy as np
-import random
+import math
+import scipy.sparse
 import matplotlib.pyplot as plt
 from pathlib import Path
 from PIL import Image
 from skimage.segmentation import felzenszwalb, slic, quickshift, mark_boundaries
-from sklearn.metrics import pairwise_distances
-from sklearn.linear_model import Ridge
 from torchvision import transforms
-import numpy as np 
+import numpy as np
 import torch
 import torch.nn.functional as F
+from torch.utils.data import Dataset, DataLoader
 from pycocotools.coco import COCO
 from shutil import copy
 import os
 
+#numba is optional: when present, sample blending runs as a compiled
+#row-parallel kernel without allocating per-sample boolean masks
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _exponential_kernel(distances, kernel_width):
+        """Fused sqrt(exp(-d^2 / w^2)) kernel: one pass, no temporaries."""
+        out = np.empty_like(distances)
+        for i in prange(distances.size):
+            out[i] = math.sqrt(math.exp(-(distances[i] * distances[i]) / (kernel_width * kernel_width)))
+        return out
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _blend_sample(sample, superpixels, original_image, masked_image, out):
+        """Blend one sample: pixels of turned-on superpixels come from masked_image."""
+        for i in prange(superpixels.shape[0]):
+            for j in range(superpixels.shape[1]):
+                if sample[superpixels[i, j]]:
+                    out[i, j] = masked_image[i, j]
+                else:
+                    out[i, j] = original_image[i, j]
+else:
+    def _exponential_kernel(distances, kernel_width):
+        """Fused sqrt(exp(-d^2 / w^2)) kernel evaluated in-place in one buffer."""
+        out = np.array(distances, dtype=np.float64)
+        np.multiply(out, out, out=out)
+        out /= -(kernel_width ** 2)
+        np.exp(out, out=out)
+        np.sqrt(out, out=out)
+        return out
+
 ### IMAGE ### 
 class ImageObject():
     
@@ -31,7 +67,12 @@ class ImageObject():
             self.original_image = np.array(original_image)
 
         self.masked_image = None
+        self.blend_stack = None
         self.superpixels = None
+        self.superpixel_ids = None
+        self.num_superpixels = None
+        self.label_counts = None
+        self.label_matrix = None
         self.label_masks = None
         self.shape = self.original_image.shape
 
@@ -40,10 +81,101 @@ class ImageObject():
         plt.imshow(self.original_image)
 
 
+### LOCAL LINEAR REGRESSION ###
+class ClosedFormRidge():
+
+    def __init__(self, alpha = 1.0):
+        """
+        Weighted ridge regression solved directly from the normal equations.
+
+        The design matrix is (num_samples, num_superpixels) with
+        num_superpixels small, so (X^T W X + alpha*I) is a tiny K x K system
+        that one BLAS matmul plus np.linalg.solve handles much faster than
+        sklearn's validated SVD-based Ridge. Exposes the subset of the sklearn
+        regressor interface used here: fit, predict, score, coef_, intercept_.
+
+        Inputs:
+            alpha: L2 regularization strength, matching sklearn's Ridge default.
+        """
+        self.alpha = alpha
+        self.coef_ = None
+        self.intercept_ = None
+
+    def fit(self, samples, labels, sample_weight = None):
+        """Fit coefficients by solving the weighted normal equations."""
+        X = np.asarray(samples, dtype=np.float64)
+        y = np.asarray(labels, dtype=np.float64)
+        if sample_weight is None:
+            weights = np.ones(X.shape[0])
+        else:
+            weights = np.asarray(sample_weight, dtype=np.float64)
+
+        #center by the weighted means so the intercept is not regularized,
+        #matching sklearn's Ridge(fit_intercept=True)
+        weight_sum = weights.sum()
+        X_mean = weights @ X / weight_sum
+        y_mean = weights @ y / weight_sum
+        X_centered = X - X_mean
+        y_centered = y - y_mean
+
+        X_weighted = X_centered * weights[:, None]
+        A = X_weighted.T @ X_centered + self.alpha * np.eye(X.shape[1])
+        B = X_weighted.T @ y_centered
+        coef = np.linalg.solve(A, B)
+
+        self.coef_ = coef.T
+        self.intercept_ = y_mean - X_mean @ coef
+        return self
+
+    def predict(self, samples):
+        """Predict labels for samples with the fitted model."""
+        return np.asarray(samples, dtype=np.float64) @ np.transpose(self.coef_) + self.intercept_
+
+    def score(self, samples, labels, sample_weight = None):
+        """Weighted R^2 score, averaged over outputs as in sklearn."""
+        y = np.asarray(labels, dtype=np.float64)
+        predictions = self.predict(samples)
+        if sample_weight is None:
+            weights = np.ones(y.shape[0])
+        else:
+            weights = np.asarray(sample_weight, dtype=np.float64)
+        if y.ndim > 1:
+            weights = weights[:, None]
+        residual = ((y - predictions) ** 2 * weights).sum(axis=0)
+        y_mean = (y * weights).sum(axis=0) / weights.sum(axis=0)
+        total = ((y - y_mean) ** 2 * weights).sum(axis=0)
+        return float(np.mean(1.0 - residual / total))
+
+
+### SAMPLE LOADING ###
+class PreprocessedSamples(Dataset):
+
+    def __init__(self, sampled_images, preprocess_function):
+        """
+        Dataset view over perturbed images that preprocesses them lazily.
+
+        Lets DataLoader workers run the per-image preprocess on the CPU while
+        the device is busy with the forward pass of the previous batch.
+
+        Inputs:
+            sampled_images: list of numpy arrays as produced by sample_superpixels.
+            preprocess_function: per-image transform returning a tensor.
+        """
+        self.sampled_images = sampled_images
+        self.preprocess_function = preprocess_function
+
+    def __len__(self):
+        return len(self.sampled_images)
+
+    def __getitem__(self, index):
+        return self.preprocess_function(self.sampled_images[index])
+
+
 ### EXPLAINER ###
 class Explainer():
 
-    def __init__(self, classifier, segmentation_method, kernel_method, preprocess_function = None, device = None):
+    def __init__(self, classifier, segmentation_method, kernel_method, preprocess_function = None, device = None,
+                 compile_classifier = False, autocast_dtype = None, random_state = None):
         """
         Initialize LIME Explainer
 
@@ -52,13 +184,21 @@ class Explainer():
             segmentation_method: SegmentationMethod
             kernel_method: KernelMethod
             preprocess_function: Preprocess function that transforms data to be the same as during
-                                 blackbox classifier training. If no normalization was used, don't 
+                                 blackbox classifier training. If no normalization was used, don't
                                  use this option.
             device: pytorch device to use, default is cuda if available else cpu.
+            compile_classifier: If True, wrap the classifier in torch.compile
+                                (mode "reduce-overhead") once, cutting launch
+                                overhead across the repeated sampling batches.
+            autocast_dtype: Optional torch dtype (e.g. torch.bfloat16) to run
+                            forward passes under torch.autocast. Softmax and
+                            outputs stay float32.
+            random_state: Optional seed for the explainer's random generator,
+                          making superpixel sampling reproducible.
         """
         self.segmentation_method = segmentation_method
         self.kernel_method = kernel_method
-        
+
         if preprocess_function is None:
             self.preprocess_function = transforms.Compose([transforms.ToTensor()])
         else:
@@ -68,6 +208,20 @@ class Explainer():
         else:
             self.device = device
         self.classifier = classifier.to(self.device)
+        if compile_classifier:
+            self.classifier = torch.compile(self.classifier, mode="reduce-overhead")
+        self.autocast_dtype = autocast_dtype
+        #one Generator per explainer: faster integer draws than the legacy
+        #global np.random state and safe to use from parallel callers
+        self._rng = np.random.default_rng(random_state)
+
+    def _forward(self, batch):
+        """Run one classifier forward pass, under autocast when configured."""
+        if self.autocast_dtype is not None:
+            with torch.autocast(device_type=torch.device(self.device).type, dtype=self.autocast_dtype):
+                out = self.classifier(batch)
+            return out.float()
+        return self.classifier(batch)
         
         
     def segment_image(self, image):
@@ -80,7 +234,58 @@ class Explainer():
             image.superpixels. A 2D numpy array with a shape corresponding to the number of pixels in image.
                                Each value indicates the superpixel that a pixel belongs to.
         """
-        image.superpixels = self.segmentation_method(image.original_image)        
+        superpixels = self.segmentation_method(image.original_image)
+        #skimage returns int64 labels; downcast and make them C-contiguous, since
+        #every later gather/compare against the label grid is memory-bound
+        if superpixels.max() < np.iinfo(np.int32).max:
+            superpixels = superpixels.astype(np.int32)
+        image.superpixels = np.ascontiguousarray(superpixels)
+        #cache the label inventory once; everything downstream reuses it
+        image.superpixel_ids = np.unique(image.superpixels)
+        image.num_superpixels = image.superpixel_ids.size
+        self._build_label_counts(image)
+
+    def _build_label_counts(self, image):
+        """
+        Count and cache the pixels per superpixel label for the image.
+
+        One bincount over the flat label grid gives the pixel count of every
+        label bin (index k holds label k). Built once per image and reused by
+        the masking and sampling steps, replacing repeated np.unique calls and
+        superpixels == label scans.
+
+        Inputs:
+            image: ImageObject with superpixels set.
+        Outputs:
+            The counts array, also stored on image.label_counts.
+        """
+        image.label_counts = np.bincount(image.superpixels.ravel())
+        return image.label_counts
+
+    def _build_label_matrix(self, image):
+        """
+        Build and cache a sparse label-to-pixel matrix for the image.
+
+        Row k of the (num_label_bins, H*W) CSR matrix marks the pixels of
+        superpixel k, so "which pixels do these superpixels cover" becomes a
+        single sparse matrix-vector product instead of per-label work. The
+        matrix is cached on the ImageObject and reused when the same image is
+        explained repeatedly.
+
+        Inputs:
+            image: ImageObject with superpixels set.
+        Outputs:
+            The CSR matrix, also stored on image.label_matrix.
+        """
+        if image.label_counts is None:
+            self._build_label_counts(image)
+        flat_superpixels = image.superpixels.ravel()
+        pixel_idx = np.arange(flat_superpixels.size)
+        data = np.ones(flat_superpixels.size, dtype=np.uint8)
+        image.label_matrix = scipy.sparse.csr_matrix(
+            (data, (flat_superpixels, pixel_idx)),
+            shape=(image.label_counts.size, flat_superpixels.size))
+        return image.label_matrix
 
     def mask_image(self, image, mask_value = None):
         """
@@ -94,19 +299,30 @@ class Explainer():
         """
 
         img = image.original_image #get original image
-        masked_img = img.copy() #copy original image
         superpixels = image.superpixels #get original superpixels
-        superpixel_ids = np.unique(superpixels) #get superpixels identifiers
 
         #set masked image pixels to average of corresponding superpixel
         if mask_value is None:
-            for x in superpixel_ids:
-                masked_img[superpixels == x] = np.mean(img[superpixels == x], axis=0)
+            if image.label_counts is None:
+                self._build_label_counts(image)
+            counts = image.label_counts
+            flat_superpixels = superpixels.ravel()
+            #one weighted bincount per channel: a single linear pass over the
+            #image, with no label sort or permuted pixel copy needed
+            channels = img.reshape(-1, img.shape[2] if img.ndim == 3 else 1)
+            sums = np.stack([np.bincount(flat_superpixels, weights=channels[:, c], minlength=counts.size)
+                             for c in range(channels.shape[1])], axis=1)
+            means_lut = (sums / np.maximum(counts, 1)[:, None]).astype(img.dtype)
+            #broadcast the per-superpixel means back onto the pixel grid
+            masked_img = means_lut[superpixels].reshape(img.shape)
         #set masked image pixels to mask_value
         else:
-            masked_img[:] = mask_value
+            masked_img = np.full_like(img, mask_value)
 
-        image.masked_image = masked_img 
+        image.masked_image = masked_img
+        #keep both blend sources in one contiguous block: sample blending then
+        #reads a compact two-row LUT instead of two separately strided images
+        image.blend_stack = np.ascontiguousarray(np.stack((image.original_image, masked_img)))
 
     def sample_superpixels(self, image, num_samples):
         """
@@ -123,60 +339,177 @@ class Explainer():
                             Sampled image with superpixels randomly tuned on/off. 
         """
         # sample num_samples collections of superpixels
-        num_superpixels = np.unique(image.superpixels).size
-        superpixel_samples = np.random.randint(2, size=(num_samples, num_superpixels))
+        if image.label_counts is None:
+            self._build_label_counts(image)
+        num_superpixels = image.label_counts.size #one on/off flag per label bin
+        #uint8 keeps the 0/1 sample matrix 8x smaller than the int64 default;
+        #it is only widened at the regression/distance boundary
+        superpixel_samples = self._rng.integers(0, 2, size=(num_samples, num_superpixels), dtype=np.uint8)
 
         # apply samples to fudged image to generate pertubed images
-        sampled_images = list()
-        for sample in superpixel_samples:
-            sample_masked_image = image.original_image.copy()
-            turned_on_superpixels = np.where(sample == 1)[0] # get indices for turned on indices
-            mask = np.zeros(image.superpixels.shape).astype(bool) 
-            for superpixel in turned_on_superpixels:  # turn on the sampled pixels
-                mask[image.superpixels == superpixel] = True
-            sample_masked_image[mask] = image.masked_image[mask]
-            sampled_images.append(sample_masked_image)
+        superpixels = image.superpixels #already downcast and contiguous from segment_image
+        if HAS_NUMBA:
+            #compiled per-sample blend, parallel across rows and without any
+            #intermediate per-pixel index arrays
+            sampled_images = list()
+            for sample in superpixel_samples.astype(bool):
+                sample_masked_image = np.empty_like(image.original_image)
+                _blend_sample(sample, superpixels, image.original_image, image.masked_image, sample_masked_image)
+                sampled_images.append(sample_masked_image)
+        else:
+            if image.blend_stack is None:
+                image.blend_stack = np.ascontiguousarray(np.stack((image.original_image, image.masked_image)))
+            #each pixel's 0/1 sample value selects its row of the flat two-image
+            #stack: one fancy-index gather, no np.where over two full images
+            flat_superpixels = superpixels.ravel()
+            flat_stack = image.blend_stack.reshape(2, flat_superpixels.size, -1)
+            on_per_pixel = superpixel_samples[:, flat_superpixels]
+            pixel_idx = np.arange(flat_superpixels.size)
+            blended = flat_stack[on_per_pixel, pixel_idx]
+            sampled_images = list(blended.reshape((len(superpixel_samples),) + image.original_image.shape))
         return superpixel_samples, sampled_images
 
-    def map_blaxbox_io(self, sampled_images):    
+    def sample_and_infer(self, image, num_samples, batch_size = 32):
+        """
+        Sample superpixel configurations and classify the perturbed images entirely on device.
+
+        The preprocessed original and masked images are uploaded once and every
+        perturbed image is blended on self.device from on-device sample masks,
+        instead of building each image in numpy and copying it to the device
+        separately. Assumes preprocess_function is a per-pixel transform
+        (e.g. ToTensor/Normalize), so preprocessing and blending commute.
+
+        Inputs:
+            image: ImageObject. Must already have superpixels and masked_image set.
+            num_samples: number of different superpixel configurations to sample
+            batch_size: Number of samples to run through the classifier per forward pass.
+
+        Outputs:
+            superpixel_samples: numpy array of shape (num_samples, num_superpixels).
+                                Superpixels on/off indicator for each sample.
+            sample_labels: Numpy array of shape (num_samples, num_labels). Predicted labels for each sample.
+        """
+        if image.label_counts is None:
+            self._build_label_counts(image)
+        num_superpixels = image.label_counts.size #one on/off flag per label bin
+
+        #preprocess the two source images once and keep them resident on the device
+        original_t = self.preprocess_function(image.original_image).to(self.device)
+        masked_t = self.preprocess_function(image.masked_image).to(self.device)
+        superpixels_t = torch.from_numpy(np.ascontiguousarray(image.superpixels)).long().to(self.device)
+
+        #sample superpixel configurations with the explainer's generator (so
+        #random_state reproduces them) and upload the small (N, K) matrix once
+        superpixel_samples = self._rng.integers(0, 2, size=(num_samples, num_superpixels), dtype=np.uint8)
+        samples_t = torch.from_numpy(superpixel_samples).to(self.device).bool()
+
+        sample_labels = list()
+        self.classifier.eval()
+        with torch.inference_mode():
+            for i in range(0, num_samples, batch_size):
+                #per-pixel on/off states via advanced indexing on the label grid
+                sample_masks = samples_t[i:i + batch_size][:, superpixels_t]
+                batch = torch.where(sample_masks.unsqueeze(1), masked_t, original_t)
+                out = self._forward(batch)
+                softmax_out = F.softmax(out, dim = 1)
+                sample_labels.append(softmax_out.cpu().numpy())
+
+        sample_labels = np.concatenate(sample_labels)
+        return superpixel_samples, sample_labels
+
+    def map_blaxbox_io(self, sampled_images, batch_size = 32, num_workers = 0):
         """
         Map samples to predicted labels/categories using blackbox classifier
 
         Inputs:
             sampled_images: Image samples resulting from different superpixel combinations.
-                            List of numpy arrays (rows, col, 3). 
+                            List of numpy arrays (rows, col, 3).
+            batch_size: Number of samples to run through the classifier per forward pass.
+            num_workers: If > 0, preprocess in that many DataLoader workers so
+                         host-side preparation overlaps the device-side forward
+                         pass of the previous batch.
 
         Outputs:
             sample_labels: Numpy array of shape (num_samples, num_labels). Predicted labels for each sample.
         """
         sample_labels = list()
         self.classifier.eval()
-        with torch.no_grad():
-            for sample_image in sampled_images:
-                sample_image = torch.unsqueeze(self.preprocess_function(sample_image), dim=0).to(self.device)
-                out = self.classifier(sample_image)
-                softmax_out = F.softmax(out, dim = 1)
-                labels = torch.squeeze(softmax_out, dim = 0).detach().cpu().numpy()
-                sample_labels.append(labels)
-        sample_labels = np.asarray(sample_labels)
+        pin_memory = torch.device(self.device).type == "cuda" #enables asynchronous host-to-device copies
+        with torch.inference_mode():
+            if num_workers > 0:
+                #workers preprocess and pin the next batch while the current one
+                #runs on the device
+                loader = DataLoader(PreprocessedSamples(sampled_images, self.preprocess_function),
+                                    batch_size=batch_size, num_workers=num_workers, pin_memory=pin_memory)
+                for batch in loader:
+                    out = self._forward(batch.to(self.device, non_blocking=True))
+                    softmax_out = F.softmax(out, dim = 1)
+                    sample_labels.append(softmax_out.cpu().numpy())
+            else:
+                #stack preprocessed samples and classify them in mini-batches to
+                #amortize per-call dispatch overhead instead of one image per forward
+                tensors = torch.stack([self.preprocess_function(sample_image) for sample_image in sampled_images])
+                if pin_memory:
+                    tensors = tensors.pin_memory()
+                for i in range(0, tensors.shape[0], batch_size):
+                    batch = tensors[i:i + batch_size].to(self.device, non_blocking=True)
+                    out = self._forward(batch)
+                    softmax_out = F.softmax(out, dim = 1)
+                    sample_labels.append(softmax_out.cpu().numpy())
+        sample_labels = np.concatenate(sample_labels)
 
         return sample_labels
 
-    def get_distances(self, superpixel_samples):
+    def get_distances(self, superpixel_samples, reference = None):
         """
         Computes the pairwise distance to the original image superpixel configuration and sampled ones.
 
         Inputs:
             superpixel_samples: the list of samples of superpixel configurations
+            reference: optional 1D array giving the reference superpixel configuration.
+                       Default is all superpixels turned on (the original image).
 
         Outputs:
             distances: 1D numpy array. Distances from superpixel samples to original image
         """
-        # make an array of ones (i.e. all superpixels on)
-        no_mask_array = np.ones(superpixel_samples.shape[1]).reshape(1, -1)
-        # distances from each sample to original
-        distances = pairwise_distances(superpixel_samples, no_mask_array, metric="cosine")
-        return distances.flatten()
+        if reference is None:
+            #cosine distance to the all-ones configuration reduces to a closed form:
+            #1 - <s, 1> / (||s|| * ||1||), so no pairwise-distance machinery is needed
+            samples = superpixel_samples.astype(np.float32)
+            row_sums = samples.sum(axis=1)
+            row_norms = np.sqrt((samples * samples).sum(axis=1))
+            num_superpixels = samples.shape[1]
+            distances = 1.0 - row_sums / (np.sqrt(num_superpixels) * row_norms + 1e-12)
+            return distances
+        #arbitrary reference: one matrix-vector product on the device instead of
+        #sklearn's scalar pairwise path
+        samples_t = torch.as_tensor(np.asarray(superpixel_samples), dtype=torch.float32, device=self.device)
+        reference_t = torch.as_tensor(np.asarray(reference), dtype=torch.float32, device=self.device)
+        norms_t = samples_t.norm(dim=1) * reference_t.norm()
+        distances_t = 1.0 - (samples_t @ reference_t) / (norms_t + 1e-12)
+        return distances_t.cpu().numpy()
+
+    def get_sample_weights(self, superpixel_samples):
+        """
+        Compute kernel weights directly from superpixel samples.
+
+        Fused alternative to get_distances followed by weigh_samples for the
+        default all-ones reference: 0/1 sample rows have norm sqrt(row_sum),
+        so the distance is 1 - sqrt(row_sum / K) and the squaring pass over
+        the (num_samples, num_superpixels) matrix disappears. The only
+        intermediate is the single distance buffer the kernel consumes.
+
+        Inputs:
+            superpixel_samples: numpy array of shape (num_samples, num_superpixels).
+                                Superpixels on/off indicator for each sample.
+
+        Outputs:
+            sample_weights: 1D numpy array. Sample distances weighed by kernel method.
+        """
+        samples = np.asarray(superpixel_samples, dtype=np.float32)
+        row_sums = samples.sum(axis=1)
+        distances = 1.0 - np.sqrt(row_sums / samples.shape[1])
+        return self.kernel_method(distances)
 
     def weigh_samples(self, distances):
         """
@@ -206,13 +539,13 @@ class Explainer():
                      Superpixels on/off indicator for each sample.
             weights: 1D numpy array. Sample distances weighed by kernel method.
             labels: Numpy array of shape (num_samples, num_labels). Predicted labels for each sample.
-            regressor: Linear regressor to use, default is ridge regression.
-        
+            regressor: Linear regressor to use, default is closed-form ridge regression.
+
         Outputs:
             model: Local linear regression model fitted to image.
         """
         if regressor is None:
-            model = Ridge()
+            model = ClosedFormRidge()
         else:
             model = regressor
         #fit model
@@ -250,16 +583,15 @@ class Explainer():
         if image.masked_image is None: # What if mask_value changes?
             self.mask_image(image, mask_value)
 
-        superpixel_samples, sampled_images = self.sample_superpixels(image, num_samples)
-        distances = self.get_distances(superpixel_samples)
-        sample_weights = self.weigh_samples(distances)
-        sample_labels = self.map_blaxbox_io(sampled_images)
+        #sample and classify on the device, without materializing perturbed images on host
+        superpixel_samples, sample_labels = self.sample_and_infer(image, num_samples)
+        sample_weights = self.get_sample_weights(superpixel_samples)
 
         # select_features()
 
         if labels is not None:
             labels = np.asarray(labels)
-        if top_labels is not None:
+        elif top_labels is not None:
             #get original blackbox labels as sorted list, where highest at first index (positive class)
             original_labels = self.map_blaxbox_io((image.original_image,))
             labels = np.flip(np.argsort(original_labels[0])[-top_labels:])
@@ -267,15 +599,16 @@ class Explainer():
             labels = np.arange(sample_labels.shape[1])
         
         #mask for important label superpixels and original image superpixels (all superpixels)
-        N = len(labels)
         mask_int = 1
-        label_masks = [np.zeros(np.shape(image.superpixels), dtype = int) for i in range(N)]
+        label_masks = list()
         origin_image_superpixels = np.arange( np.shape(superpixel_samples)[1] )
+        if image.label_matrix is None:
+            self._build_label_matrix(image)
 
         #fit local linear models
-        for l in labels:
+        for label in labels:
             #slice label
-            sample_label = sample_labels[:, labels[l]]
+            sample_label = sample_labels[:, label]
             LLR_model, r2_score = self.fit_LLR(superpixel_samples, sample_weights, sample_label, regressor)
             #coefficient for X1, X2, X3 superpixels correspond superpixel ids 0,1,2,3. 
             superpixel_weights = [(coef[0], coef[1]) for coef in enumerate(LLR_model.coef_)]
@@ -285,14 +618,16 @@ class Explainer():
        
             #get num_superpixels amount superpixel_ids
             display_superpixels = [superpixel_weights[i][0] for i in range(num_superpixels)]
-            #create label mask area from best_superpixels
-            for pixel in display_superpixels:
-                label_masks[l][image.superpixels == pixel] = mask_int
-            
+            #create label mask area from best_superpixels: one sparse matvec over
+            #the cached label-to-pixel matrix marks all chosen superpixels at once
+            label_lut = np.zeros(np.shape(superpixel_samples)[1], dtype = int)
+            label_lut[display_superpixels] = mask_int
+            label_masks.append((label_lut @ image.label_matrix).reshape(np.shape(image.superpixels)))
+
             #display image and results
             if display:
-                self.display_image_explanation(image, label_masks[l])
-                print(f"Class stats: {classes[labels[l]]}\nIntercept:{intercept} R^2:{r2_score} Prediction on ori. image {LLR_pred}")
+                self.display_image_explanation(image, label_masks[-1])
+                print(f"Class stats: {classes[label]}\nIntercept:{intercept} R^2:{r2_score} Prediction on ori. image {LLR_pred}")
         
         image.label_masks = label_masks
            
@@ -305,7 +640,7 @@ class Explainer():
         Output:
             image with explanatory superpixels marked as masks 
         """
-        R, G, B = random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)
+        R, G, B = self._rng.integers(0, 256, size=3)
         plt.figure()
         img_boundary = mark_boundaries(image.original_image, label_mask, color = (R/255, G/255, B/255),
                                        outline_color = (R/255, G/255, B/255))
@@ -362,8 +697,8 @@ class Explainer():
 
 
     def coco_evaluation_score(self, LIME_binary_mask, COCO_binary_mask):
-        seg_size = len(np.where(LIME_binary_mask == 1)[0])  # vores segment
-        intersect_size = len(np.where((LIME_binary_mask == 1) & (COCO_binary_mask == 1))[0])  # sammenlign segment med coco
+        seg_size = np.count_nonzero(LIME_binary_mask == 1)  # vores segment
+        intersect_size = np.count_nonzero((LIME_binary_mask == 1) & (COCO_binary_mask == 1))  # sammenlign segment med coco
         coverage = intersect_size/seg_size
         return coverage
 
@@ -379,7 +714,7 @@ class Explainer():
 ### SEGMENTATION ###
 class SegmentationMethod():
 
-    def __init__(self, method="quickshift", **method_args):
+    def __init__(self, method="quickshift", backend="skimage", **method_args):
         """
         Set image segmentation method as a predefined algorithm or custom function
 
@@ -387,21 +722,60 @@ class SegmentationMethod():
             method: Either a string specifying one of predefined segmentaion algorithms:
                     "quickshift", "felzenszwalb", "slic",
                     Or a custom segmentation function.
+            backend: "skimage" (default) runs the predefined algorithms on CPU.
+                     "cucim" runs them on the GPU through cuCIM/cupy.
+                     "fast_slic" uses the fast-slic package ("slic" only).
+                     The non-default backends need their optional package installed.
             method_args: Any extra arguments needed by the chosen method.
         """
         self.method = method
+        self.backend = backend
         self.method_args = method_args
 
-        if self.method == "quickshift":
+        if not isinstance(method, str):
+            self.segmentation_method = method
+        elif backend == "cucim":
+            self.segmentation_method = self._cucim_method(method)
+        elif backend == "fast_slic":
+            self.segmentation_method = self._fast_slic_method(method)
+        elif backend != "skimage":
+            raise KeyError(f"Unknown segmentation backend: {backend}")
+        elif self.method == "quickshift":
             self.segmentation_method = quickshift
         elif self.method == "felzenszwalb":
             self.segmentation_method = felzenszwalb
         elif self.method == "slic":
             self.segmentation_method = slic
-        elif isinstance(method, str):
-            raise KeyError(f"Unknown segmentation algorithm: {method}")
         else:
-            self.segmentation_method = method
+            raise KeyError(f"Unknown segmentation algorithm: {method}")
+
+    def _cucim_method(self, method):
+        """Wrap a cuCIM segmentation algorithm so it takes and returns numpy arrays."""
+        try:
+            import cupy
+            from cucim.skimage import segmentation as cucim_segmentation
+        except ImportError as err:
+            raise ImportError('backend="cucim" requires the cucim and cupy packages') from err
+        if not hasattr(cucim_segmentation, method):
+            raise KeyError(f"Unknown segmentation algorithm: {method}")
+        gpu_method = getattr(cucim_segmentation, method)
+
+        def segment_on_gpu(img, **method_args):
+            return cupy.asnumpy(gpu_method(cupy.asarray(img), **method_args))
+        return segment_on_gpu
+
+    def _fast_slic_method(self, method):
+        """Wrap the fast-slic SLIC implementation behind the skimage-style call."""
+        if method != "slic":
+            raise KeyError(f'backend="fast_slic" only implements "slic", not {method}')
+        try:
+            from fast_slic import Slic
+        except ImportError as err:
+            raise ImportError('backend="fast_slic" requires the fast_slic package') from err
+
+        def segment_fast_slic(img, **method_args):
+            return Slic(**method_args).iterate(np.ascontiguousarray(img))
+        return segment_fast_slic
                 
     def __call__(self, img):
         """
@@ -428,7 +802,7 @@ class KernelMethod():
         self.method_args = method_args
 
         if self.method == "exponential":
-            self.kernel_method = lambda distances, kernel_width: np.sqrt(np.exp(-(distances ** 2) / kernel_width ** 2))
+            self.kernel_method = _exponential_kernel
         elif isinstance(method, str):
             raise KeyError(f"Unknown kernel algorithm: {method}")
         else: